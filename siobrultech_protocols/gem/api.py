@@ -15,7 +15,7 @@ from .const import (
     CMD_SET_PACKET_SEND_INTERVAL,
     CMD_SET_SECONDARY_PACKET_FORMAT,
 )
-from .protocol import ApiCall, BidirectionalProtocol, R, T
+from .protocol import ApiCall, BidirectionalProtocol, NoArgApiCall, R, T
 
 TIMEOUT = timedelta(seconds=15)
 
@@ -37,7 +37,7 @@ async def call_api(
 
     delay = protocol.begin_api_request()
     try:
-        await asyncio.sleep(delay.seconds)
+        await asyncio.sleep(delay.total_seconds())
         yield send
     finally:
         protocol.end_api_request()
@@ -103,7 +103,7 @@ def parse_ecm_serial_number_from_settings(binary: bytes) -> int | None:
     return int(f"{device_id}{serial_number:05}")
 
 
-GET_SERIAL_NUMBER = ApiCall[None, int](
+GET_SERIAL_NUMBER = NoArgApiCall[int](
     gem_formatter=lambda _: CMD_GET_SERIAL_NUMBER,
     gem_parser=NewlineTerminatedStringResponseParser(lambda response: int(response)),
     ecm_formatter=lambda _: [b"\xfc", b"SET", b"RCV"],
@@ -116,8 +116,19 @@ async def get_serial_number(
     serial_number: Optional[int] = None,
     timeout: Optional[timedelta] = None,
 ) -> int:
-    async with call_api(GET_SERIAL_NUMBER, protocol, serial_number, timeout) as f:
-        return await f(None)
+    # This is a single request, so drive the protocol directly rather than paying for
+    # the call_api context manager.
+    if timeout is None:
+        timeout = TIMEOUT
+
+    delay = protocol.begin_api_request()
+    try:
+        await asyncio.sleep(delay.total_seconds())
+        future = asyncio.get_event_loop().create_future()
+        protocol.invoke_api(GET_SERIAL_NUMBER, None, future, serial_number)
+        return await asyncio.wait_for(future, timeout=timeout.total_seconds())
+    finally:
+        protocol.end_api_request()
 
 
 SET_DATE_AND_TIME = ApiCall[datetime, bool](
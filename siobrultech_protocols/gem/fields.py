@@ -2,10 +2,15 @@
 Field types used in
 https://www.brultech.com/software/files/downloadSoft/GEM-PKT_Packet_Format_2_1.pdf
 """
+from __future__ import annotations
+
+import struct
 from abc import ABC, abstractmethod
+from array import array
 from datetime import datetime
 from enum import Enum, unique
-from typing import Any, List
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Tuple
 
 
 @unique
@@ -71,6 +76,32 @@ class NumericField(Field):
     def read(self, buffer: bytes, offset: int) -> int:
         return _parse(buffer[offset : offset + self.size], self.order, self.signed)
 
+    def read_many(self, buffer: bytes, offset: int, count: int) -> List[int]:
+        """Read `count` consecutive values of this field starting at the given offset."""
+        size = self.size
+        layout = _array_layout(size, self.order, count)
+        if layout is None:
+            byteorder = "little" if self.order == ByteOrder.LoToHi else "big"
+            values = [
+                int.from_bytes(buffer[i : i + size], byteorder)
+                for i in range(offset, offset + count * size, size)
+            ]
+        else:
+            unpacker, shift = layout
+            raw = unpacker.unpack_from(buffer, offset)
+            if not shift:
+                values = list(raw)
+            elif self.order == ByteOrder.LoToHi:
+                values = [lo | (hi << shift) for lo, hi in zip(raw[::2], raw[1::2])]
+            else:
+                values = [lo | (hi << shift) for hi, lo in zip(raw[::2], raw[1::2])]
+
+        if self.signed == Sign.Signed:
+            # See _parse for how the sign is encoded.
+            sign_bit = 1 << (8 * size - 1)
+            values = [-(v ^ sign_bit) if v & sign_bit else v for v in values]
+        return values
+
     def write(self, value: int, buffer: bytearray) -> None:
         temp = bytearray(self.size)
         _format(value, self.order, self.signed, temp)
@@ -95,6 +126,13 @@ class FloatingPointField(Field):
     def read(self, buffer: bytes, offset: int) -> float:
         return self.raw_field.read(buffer, offset) / self.divisor
 
+    def read_many(self, buffer: bytes, offset: int, count: int) -> List[float]:
+        """Read `count` consecutive values of this field starting at the given offset."""
+        divisor = self.divisor
+        return [
+            value / divisor for value in self.raw_field.read_many(buffer, offset, count)
+        ]
+
     def write(self, value: float, buffer: bytearray) -> None:
         int_value = round(value * self.divisor)
         self.raw_field.write(int_value, buffer)
@@ -156,13 +194,13 @@ class ArrayField(Field):
         self.elem_field: Field = elem_field
         self.num_elems: int = num_elems
 
-    def read(self, buffer: bytes, offset: int) -> List[Any]:
+    def read(self, buffer: bytes, offset: int) -> Sequence[Any]:
         return [
             self.elem_field.read(buffer, offset + i * self.elem_field.size)
             for i in range(self.num_elems)
         ]
 
-    def write(self, value: List[Any], buffer: bytearray) -> None:
+    def write(self, value: Sequence[Any], buffer: bytearray) -> None:
         for item in value[0 : self.num_elems]:
             self.elem_field.write(item, buffer)
 
@@ -185,10 +223,44 @@ class FloatingPointArrayField(ArrayField):
             ),
         )
 
-    def read(self, buffer: bytes, offset: int) -> List[float]:
-        return super().read(buffer, offset)
+    def read(self, buffer: bytes, offset: int) -> array[float]:
+        return array("d", self.elem_field.read_many(buffer, offset, self.num_elems))
 
-    def write(self, value: List[float], buffer: bytearray) -> None:
+    def write(self, value: Sequence[float], buffer: bytearray) -> None:
+        super().write(value, buffer)
+
+
+class NullableFloatingPointArrayField(ArrayField):
+    """An array of floating point values in which any value above `max_value` is a
+    placeholder the device sends when it has no reading, and is read as None."""
+
+    elem_field: FloatingPointField
+
+    def __init__(
+        self,
+        num_elems: int,
+        size: int,
+        order: ByteOrder,
+        signed: Sign,
+        divisor: float,
+        max_value: float,
+    ):
+        super().__init__(
+            num_elems=num_elems,
+            elem_field=FloatingPointField(
+                size=size, order=order, signed=signed, divisor=divisor
+            ),
+        )
+        self.max_value: float = max_value
+
+    def read(self, buffer: bytes, offset: int) -> List[Optional[float]]:
+        max_value = self.max_value
+        return [
+            value if value <= max_value else None
+            for value in self.elem_field.read_many(buffer, offset, self.num_elems)
+        ]
+
+    def write(self, value: Sequence[float], buffer: bytearray) -> None:
         super().write(value, buffer)
 
 
@@ -201,10 +273,13 @@ class NumericArrayField(ArrayField):
             elem_field=NumericField(size=size, order=order, signed=signed),
         )
 
-    def read(self, buffer: bytes, offset: int) -> List[int]:
-        return super().read(buffer, offset)
+    def read(self, buffer: bytes, offset: int) -> array[int]:
+        typecode = "Q" if self.elem_field.signed == Sign.Unsigned else "q"
+        return array(
+            typecode, self.elem_field.read_many(buffer, offset, self.num_elems)
+        )
 
-    def write(self, value: List[int], buffer: bytearray) -> None:
+    def write(self, value: Sequence[int], buffer: bytearray) -> None:
         super().write(value, buffer)
 
     @property
@@ -212,16 +287,39 @@ class NumericArrayField(ArrayField):
         return self.elem_field.max
 
 
+_STRUCT_CODES = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+
+@lru_cache(maxsize=None)
+def _array_layout(
+    size: int, order: ByteOrder, count: int
+) -> Optional[Tuple[struct.Struct, int]]:
+    """Builds a Struct that unpacks `count` consecutive unsigned values of the given
+    size and order in one call, along with the shift needed to combine the two parts
+    each value is split into (or 0 if each value is unpacked whole). struct has no 3
+    or 5 byte codes, so such values are unpacked as a low part and a 1 byte high part.
+    Returns None if the size cannot be expressed this way."""
+    prefix = "<" if order == ByteOrder.LoToHi else ">"
+    if size in _STRUCT_CODES:
+        return struct.Struct(prefix + _STRUCT_CODES[size] * count), 0
+
+    for low_size in (4, 2, 1):
+        high_size = size - low_size
+        if 0 < high_size <= low_size and high_size in _STRUCT_CODES:
+            low, high = _STRUCT_CODES[low_size], _STRUCT_CODES[high_size]
+            pair = low + high if order == ByteOrder.LoToHi else high + low
+            return struct.Struct(prefix + pair * count), 8 * low_size
+    return None
+
+
 def _parse(
     raw_octets: bytes, order: ByteOrder = ByteOrder.HiToLo, signed: Sign = Sign.Unsigned
 ) -> int:
     """Reads the given octets as a big-endian value. The function name comes
     from how such values are described in the packet format spec."""
-    octets = list(raw_octets)
-    if len(octets) == 0:
-        return 0
-    if order == ByteOrder.LoToHi:
-        octets.reverse()
+    result = int.from_bytes(
+        raw_octets, "little" if order == ByteOrder.LoToHi else "big"
+    )
 
     # If this is a signed field (i.e., temperature), the highest-order
     # bit indicates sign. Detect this (and clear the bit so we can
@@ -229,15 +327,11 @@ def _parse(
     #
     # This isn't documented in the protocol spec, but matches other
     # implementations.
-    sign = 1
-    if signed == Sign.Signed and (octets[0] & 0x80):
-        octets[0] &= ~0x80
-        sign = -1
-
-    result = 0
-    for octet in octets:
-        result = (result << 8) + octet
-    return sign * result
+    if signed == Sign.Signed and result:
+        sign_bit = 1 << (8 * len(raw_octets) - 1)
+        if result & sign_bit:
+            return -(result ^ sign_bit)
+    return result
 
 
 def _format(value: int, order: ByteOrder, signed: Sign, buffer: bytearray) -> None:
@@ -5,12 +5,15 @@ https://www.brultech.com/software/files/downloadSoft/GEM-PKT_Packet_Format_2_1.p
 from __future__ import annotations
 
 import codecs
+import inspect
 import json
-from collections import OrderedDict
+from array import array
 from copy import copy
 from datetime import datetime
 from enum import IntEnum, unique
-from typing import Any, Dict, List, Optional
+from functools import cached_property
+from time import time_ns
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from .fields import (
     ByteField,
@@ -20,62 +23,103 @@ from .fields import (
     Field,
     FloatingPointArrayField,
     FloatingPointField,
+    NullableFloatingPointArrayField,
     NumericArrayField,
     NumericField,
     Sign,
 )
 
+try:
+    # orjson is considerably faster than the standard library when it is available.
+    import orjson
+
+    def _dumps(obj: Dict[str, Any]) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+
+    def _dumps(obj: Dict[str, Any]) -> str:
+        return json.dumps(obj)
+
+
+def _as_list(values: Optional[Sequence[Any]]) -> Optional[List[Any]]:
+    return list(values) if values is not None else None
+
 
 class MalformedPacketException(Exception):
     pass
 
 
 class Packet(object):
+    """A decoded packet. Parsed numeric arrays are array.array instances (pulse_counts
+    and aux default to empty ones when the format has no such field), so treat them as
+    Sequences rather than lists."""
+
+    __slots__ = (
+        "packet_format",
+        "voltage",
+        "absolute_watt_seconds",
+        "polarized_watt_seconds",
+        "currents",
+        "device_id",
+        "serial_number",
+        "seconds",
+        "pulse_counts",
+        "temperatures",
+        "_time_stamp",
+        "_created_at_ns",
+        "aux",
+        "dc_voltage",
+    )
+
     def __init__(
         self,
         packet_format: PacketFormat,
         voltage: float,
-        absolute_watt_seconds: List[int],
+        absolute_watt_seconds: Sequence[int],
         device_id: int,
         serial_number: int,
         seconds: int,
-        pulse_counts: Optional[List[int]] = None,
+        pulse_counts: Optional[Sequence[int]] = None,
         temperatures: Optional[List[Optional[float]]] = None,
-        polarized_watt_seconds: Optional[List[int]] = None,
-        currents: Optional[List[float]] = None,
+        polarized_watt_seconds: Optional[Sequence[int]] = None,
+        currents: Optional[Sequence[float]] = None,
         time_stamp: Optional[datetime] = None,
-        aux: Optional[List[int]] = None,
+        aux: Optional[Sequence[int]] = None,
         dc_voltage: Optional[int] = None,
-        **kwargs: Dict[str, Any],
     ):
         self.packet_format: PacketFormat = packet_format
         self.voltage: float = voltage
-        self.absolute_watt_seconds: List[int] = absolute_watt_seconds
-        self.polarized_watt_seconds: Optional[List[int]] = polarized_watt_seconds
-        self.currents: Optional[List[float]] = currents
+        self.absolute_watt_seconds: Sequence[int] = absolute_watt_seconds
+        self.polarized_watt_seconds: Optional[Sequence[int]] = polarized_watt_seconds
+        self.currents: Optional[Sequence[float]] = currents
         self.device_id: int = device_id
         self.serial_number: int = serial_number
         self.seconds: int = seconds
-        self.pulse_counts: List[int] = pulse_counts or []
+        self.pulse_counts: Sequence[int] = (
+            pulse_counts if pulse_counts is not None else array("Q")
+        )
         self.temperatures: List[float | None] = temperatures or []
-        if time_stamp:
-            self.time_stamp: datetime = time_stamp
-        else:
-            self.time_stamp: datetime = datetime.now()
-        self.aux: List[int] = aux or []
+        # Building a datetime is comparatively slow, so when no time stamp is given
+        # just note the current time and only build the datetime if it is asked for.
+        self._time_stamp: Optional[datetime] = time_stamp
+        self._created_at_ns: int = 0 if time_stamp else time_ns()
+        self.aux: Sequence[int] = aux if aux is not None else array("Q")
         self.dc_voltage = dc_voltage
 
     def __str__(self) -> str:
-        return json.dumps(
+        # Parsed packets hold their numeric arrays as array.array, which neither json
+        # nor orjson can serialize directly.
+        return _dumps(
             {
-                "aux": self.aux,
-                "absolute_watt_seconds": self.absolute_watt_seconds,
-                "currents": self.currents,
+                "aux": _as_list(self.aux),
+                "absolute_watt_seconds": _as_list(self.absolute_watt_seconds),
+                "currents": _as_list(self.currents),
                 "dc_voltage": self.dc_voltage,
                 "device_id": self.device_id,
                 "packet_format": str(self.packet_format),
-                "polarized_watt_seconds": self.polarized_watt_seconds,
-                "pulse_counts": self.pulse_counts,
+                "polarized_watt_seconds": _as_list(self.polarized_watt_seconds),
+                "pulse_counts": _as_list(self.pulse_counts),
                 "seconds": self.seconds,
                 "serial_number": self.serial_number,
                 "temperatures": self.temperatures,
@@ -84,6 +128,21 @@ class Packet(object):
             }
         )
 
+    @property
+    def time_stamp(self) -> datetime:
+        if self._time_stamp is None:
+            # Round down to the microsecond, like datetime.now() does, rather than
+            # letting fromtimestamp() round a float to the nearest microsecond.
+            seconds, nanoseconds = divmod(self._created_at_ns, 10**9)
+            self._time_stamp = datetime.fromtimestamp(seconds).replace(
+                microsecond=nanoseconds // 1000
+            )
+        return self._time_stamp
+
+    @time_stamp.setter
+    def time_stamp(self, value: datetime) -> None:
+        self._time_stamp = value
+
     @property
     def num_channels(self) -> int:
         """The number of channels in the packet given the format.  There may be fewer on the device."""
@@ -95,40 +154,33 @@ class Packet(object):
         return self.packet_format.name
 
     def delta_seconds(self, prev: int) -> int:
-        field = self.packet_format.fields["seconds"]
-        assert isinstance(field, NumericField)
-        return self._delta_value(field, self.seconds, prev)
+        max_value = self.packet_format.max_values["seconds"]
+        return self._delta_value(max_value, self.seconds, prev)
 
     def delta_pulse_count(self, index: int, prev: int) -> int:
-        field = self.packet_format.fields["pulse_counts"]
-        assert isinstance(field, NumericArrayField)
-        return self._delta_value(field.elem_field, self.pulse_counts[index], prev)
+        max_value = self.packet_format.max_values["pulse_counts"]
+        return self._delta_value(max_value, self.pulse_counts[index], prev)
 
     def delta_aux_count(self, index: int, prev: int) -> int:
-        field = self.packet_format.fields["aux"]
-        assert isinstance(field, NumericArrayField)
-        return self._delta_value(field.elem_field, self.aux[index], prev)
+        max_value = self.packet_format.max_values["aux"]
+        return self._delta_value(max_value, self.aux[index], prev)
 
     def delta_absolute_watt_seconds(self, index: int, prev: int) -> int:
-        field = self.packet_format.fields["absolute_watt_seconds"]
-        assert isinstance(field, NumericArrayField)
-        return self._delta_value(
-            field.elem_field, self.absolute_watt_seconds[index], prev
-        )
+        max_value = self.packet_format.max_values["absolute_watt_seconds"]
+        return self._delta_value(max_value, self.absolute_watt_seconds[index], prev)
 
     def delta_polarized_watt_seconds(self, index: int, prev: int) -> int:
-        field = self.packet_format.fields["polarized_watt_seconds"]
-        assert isinstance(field, NumericArrayField)
+        max_value = self.packet_format.max_values["polarized_watt_seconds"]
         if self.polarized_watt_seconds is not None:
             return self._delta_value(
-                field.elem_field, self.polarized_watt_seconds[index], prev
+                max_value, self.polarized_watt_seconds[index], prev
             )
         else:
             return 0
 
-    def _delta_value(self, field: NumericField, cur: int, prev: int) -> int:
+    def _delta_value(self, max_value: int, cur: int, prev: int) -> int:
         if prev > cur:
-            diff = field.max + 1 - prev
+            diff = max_value + 1 - prev
             diff += cur
         else:
             diff = cur - prev
@@ -241,9 +293,15 @@ class PacketFormat(object):
         self.type: PacketFormatType = type
         self.code = code
         self.num_channels: int = num_channels
-        self.fields: OrderedDict[str, Field] = OrderedDict()
+        self.fields: Dict[str, Field] = {}
 
     def __str__(self) -> str:
+        return self._description
+
+    @cached_property
+    def _description(self) -> str:
+        # Always the standard library, so that the description embedded in a packet's
+        # JSON is the same whichever backend is installed.
         return json.dumps(
             {
                 "name": self.name,
@@ -253,46 +311,79 @@ class PacketFormat(object):
             }
         )
 
-    @property
+    # The layout is computed on first use, since subclasses populate `fields` after
+    # this base class has been initialized.
+    @cached_property
     def size(self) -> int:
-        result = 0
-        for value in self.fields.values():
-            result += value.size
+        return sum(field.size for field in self.fields.values())
 
+    @cached_property
+    def max_values(self) -> Dict[str, int]:
+        """The largest value each numeric field (or each element of a numeric array
+        field) can hold, keyed by field name."""
+        result: Dict[str, int] = {}
+        for key, field in self.fields.items():
+            if isinstance(field, (NumericField, NumericArrayField)):
+                result[key] = field.max
         return result
 
-    def parse(self, data: bytes) -> Packet:
-        if len(data) < self.size:
-            raise MalformedPacketException(
-                "Packet too short. Expected {0} bytes, found {1} bytes.".format(
-                    self.size, len(data)
-                )
-            )
-        _checksum(data, self.size)
-
+    @cached_property
+    def _layout(self) -> Tuple[Tuple[str, Field, int], ...]:
+        """Each field's key, field, and offset into the packet, in packet order."""
+        layout: List[Tuple[str, Field, int]] = []
         offset = 0
-        args = {
-            "packet_format": self,
+        for key, field in self.fields.items():
+            layout.append((key, field, offset))
+            offset += field.size
+        return tuple(layout)
+
+    @cached_property
+    def _frame_offsets(self) -> Tuple[int, int]:
+        """The offsets of the code and footer fields in the packet."""
+        offsets = {key: offset for key, _, offset in self._layout}
+        return offsets["code"], offsets["footer"]
+
+    @cached_property
+    def _decoder(self) -> Callable[[bytes], Packet]:
+        """A function generated from this format's layout that decodes the fields of an
+        already validated packet, with every field's reader and offset inlined."""
+        namespace: Dict[str, Any] = {
+            "_Packet": Packet,
+            "_packet_format": self,
+            "_from_bytes": int.from_bytes,
         }
-        for key, value in self.fields.items():
-            args[key] = value.read(data, offset)
-            offset += value.size
-
-        if args["code"] != self.code:
-            raise MalformedPacketException(
-                "bad code {0} im packet: {1}".format(
-                    args["code"], codecs.encode(data, "hex")
-                )
-            )
+        # Only the fields that become Packet arguments are decoded. Framing fields
+        # like the header, code, and footer were already checked by _validate_frame,
+        # and the Packet is built with positional arguments.
+        arguments = list(inspect.signature(Packet).parameters)[1:]
+        lines = ["def decode(_data):"]
+        for index, (key, field, offset) in enumerate(self._layout):
+            if key not in arguments:
+                continue
+            assert key.isidentifier() and not key.startswith("_")
+            expression = _inline_read(field, offset)
+            if expression is None:
+                namespace[f"_read_{index}"] = field.read
+                expression = f"_read_{index}(_data, {offset})"
+            lines.append(f"    {key} = {expression}")
+        values = ", ".join(key if key in self.fields else "None" for key in arguments)
+        lines.append(f"    return _Packet(_packet_format, {values})")
+
+        exec("\n".join(lines), namespace)
+        return namespace["decode"]
 
-        if args["footer"] != 0xFFFE:
+    def parse(self, data: bytes) -> Packet:
+        size = self.size
+        if len(data) < size:
             raise MalformedPacketException(
-                "bad footer {0} in packet: {1}".format(
-                    hex(args["footer"]), codecs.encode(data, "hex")  # type: ignore
+                "Packet too short. Expected {0} bytes, found {1} bytes.".format(
+                    size, len(data)
                 )
             )
+        code_offset, footer_offset = self._frame_offsets
+        _validate_frame(data, size, self.code, code_offset, footer_offset)
 
-        return Packet(**args)  # type: ignore
+        return self._decoder(data)
 
     def format(self, packet: Packet) -> bytes:
         result = bytearray()
@@ -394,12 +485,14 @@ class GEMPacketFormat(PacketFormat):
         self.fields["pulse_counts"] = NumericArrayField(
             GEMPacketFormat.NUM_PULSE_COUNTERS, 3, ByteOrder.LoToHi, Sign.Unsigned
         )
-        self.fields["temperatures"] = FloatingPointArrayField(
+        self.fields["temperatures"] = NullableFloatingPointArrayField(
             GEMPacketFormat.NUM_TEMPERATURE_SENSORS,
             2,
             ByteOrder.LoToHi,
             Sign.Signed,
             2.0,
+            # Above 255 means it wasn't able to read the sensor (though we sometimes also get 0 for that)
+            max_value=255.0,
         )
         if num_channels == 32:
             self.fields["spare_bytes"] = BytesField(2)
@@ -408,15 +501,6 @@ class GEMPacketFormat(PacketFormat):
         self.fields["footer"] = NumericField(2, ByteOrder.HiToLo, Sign.Unsigned)
         self.fields["checksum"] = ByteField()
 
-    def parse(self, data: bytes) -> Packet:
-        packet = super().parse(data)
-        packet.temperatures = [
-            # Above 255 means it wasn't able to read the sensor (though we sometimes also get 0 for that)
-            temperature if temperature is not None and temperature <= 255.0 else None
-            for temperature in packet.temperatures
-        ]
-        return packet
-
     def format(self, packet: Packet) -> bytes:
         packet = copy(packet)
         packet.temperatures = [
@@ -426,17 +510,53 @@ class GEMPacketFormat(PacketFormat):
         return super().format(packet)
 
 
+def _inline_read(field: Field, offset: int) -> Optional[str]:
+    """Returns a Python expression that reads the given scalar field from `_data`
+    without a method call, or None if the field has to be read through its read()."""
+    if isinstance(field, FloatingPointField):
+        raw = _inline_read(field.raw_field, offset)
+        return f"{raw} / {field.divisor!r}" if raw is not None else None
+    if not isinstance(field, NumericField) or field.signed != Sign.Unsigned:
+        return None
+    if field.size == 1:
+        return f"_data[{offset}]"
+    byteorder = "little" if field.order == ByteOrder.LoToHi else "big"
+    return f"_from_bytes(_data[{offset}:{offset + field.size}], {byteorder!r})"
+
+
 def _compute_checksum(packet: bytes, size: int) -> int:
-    checksum = 0
-    for i in packet[: size - 1]:
-        checksum += i
-    checksum = checksum % 256
-    return checksum
+    # Summing a memoryview keeps the per-byte loop in C and avoids copying the
+    # packet. The view is released right away so that a bytearray buffer can
+    # still be resized by the caller afterwards.
+    with memoryview(packet) as view:
+        return sum(view[: size - 1]) & 0xFF
+
+
+def _validate_frame(
+    packet: bytes, size: int, code: int, code_offset: int, footer_offset: int
+) -> None:
+    """Checks the footer, format code, and checksum of a packet, so that a bad packet
+    is rejected before any of its fields are decoded. The code is a single byte and
+    the footer is 2 bytes, high byte first, at the given offsets."""
+    # The cheap footer and code checks run first, so a packet parsed with the wrong
+    # format (e.g., BIN48-NET-TIME parsed as BIN48-NET) is usually rejected without
+    # summing the whole packet.
+    footer = (packet[footer_offset] << 8) | packet[footer_offset + 1]
+    if footer != 0xFFFE:
+        raise MalformedPacketException(
+            "bad footer {0} in packet: {1}".format(
+                hex(footer), codecs.encode(packet, "hex")
+            )
+        )
 
+    if packet[code_offset] != code:
+        raise MalformedPacketException(
+            "bad code {0} im packet: {1}".format(
+                packet[code_offset], codecs.encode(packet, "hex")
+            )
+        )
 
-def _checksum(packet: bytes, size: int) -> None:
-    checksum = _compute_checksum(packet, size)
-    if checksum != packet[size - 1]:
+    if _compute_checksum(packet, size) != packet[size - 1]:
         raise MalformedPacketException(
             "bad checksum for packet: {0}".format(codecs.encode(packet[:size], "hex"))
         )
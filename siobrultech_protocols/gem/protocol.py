@@ -337,6 +337,38 @@ class ApiCall(Generic[T, R]):
             assert False
 
 
+class NoArgApiCall(ApiCall[None, R]):
+    """
+    An ApiCall that takes no argument. Since its request is always the same, it is
+    formatted once up front instead of on every call.
+    """
+
+    def __init__(
+        self,
+        gem_formatter: Callable[[None], str],
+        gem_parser: Callable[[str], R | None] | None,
+        ecm_formatter: Callable[[None], List[bytes]] | None,
+        ecm_parser: Callable[[bytes], R | None] | None,
+    ) -> None:
+        super().__init__(gem_formatter, gem_parser, ecm_formatter, ecm_parser)
+        self._gem_request = gem_formatter(None).encode()
+        self._ecm_request = tuple(ecm_formatter(None)) if ecm_formatter else None
+
+    def format(
+        self,
+        api_type: ApiType,
+        arg: None,
+        serial_number: int | None,
+    ) -> List[bytes]:
+        if api_type == ApiType.GEM and not serial_number:
+            return [self._gem_request]
+        elif api_type == ApiType.ECM and self._ecm_request is not None:
+            return list(self._ecm_request)
+        else:
+            # Targeting a serial number changes the GEM request, so format it as usual.
+            return super().format(api_type, arg, serial_number)
+
+
 class BidirectionalProtocol(PacketProtocol):
     """Protocol implementation for bi-directional communication with a GreenEye Monitor."""
 
@@ -1,5 +1,6 @@
 import datetime
 import os
+from array import array
 from io import StringIO
 from typing import Iterable
 
@@ -814,6 +815,8 @@ def assert_packet(packet_file_name: str, parsed_packet: Packet):
 
     for key, expected_value in sorted(expected_packet.items(), key=lambda x: x[0]):
         actual_value = getattr(parsed_packet, key)
+        if isinstance(actual_value, array):
+            actual_value = actual_value.tolist()
         if expected_value != actual_value:
             expected.write(
                 "{key}={expected},\n".format(key=key, expected=repr(expected_value))
@@ -4,7 +4,7 @@ import asyncio
 from datetime import datetime, timedelta
 from typing import List, Optional
 from unittest.async_case import IsolatedAsyncioTestCase
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 from siobrultech_protocols.gem.api import (
     GET_SERIAL_NUMBER,
@@ -90,6 +90,16 @@ class TestApi(IsolatedAsyncioTestCase):
             1234567,
         )
 
+    async def testGEMGetSerialNumberWithSerialNumber(self):
+        await self.assertCall(
+            GET_SERIAL_NUMBER,
+            "^^^NMB34567RQSSRN",
+            None,
+            1234567,
+            "1234567\r\n".encode(),
+            1234567,
+        )
+
     async def testECMGetSerialNumber(self):
         await self.assertECMCall(
             GET_SERIAL_NUMBER,
@@ -255,6 +265,18 @@ class TestContextManager(IsolatedAsyncioTestCase):
                 async with call_api(call, self._protocol):
                     raise AssertionError("this should not be reached")
 
+    async def testSubSecondPacketDelay(self):
+        protocol = BidirectionalProtocol(
+            self._queue,
+            packet_delay_clear_time=timedelta(milliseconds=500),
+            api_type=ApiType.GEM,
+        )
+        protocol.connection_made(self._transport)
+        call = ApiCall(lambda _: "REQUEST", lambda response: response, None, None)
+        with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            async with call_api(call, protocol):
+                mock_sleep.assert_awaited_once_with(0.5)
+
     def setApiResponse(self, ecnoded_response: bytes) -> asyncio.Task[None]:
         async def notify_data_received() -> None:
             self._protocol.data_received(ecnoded_response)
@@ -285,6 +307,14 @@ class TestApiHelpers(IsolatedAsyncioTestCase):
         serial = await get_serial_number(self._protocol)
         self.assertEqual(serial, 1234567)
 
+    async def test_get_serial_number_timeout(self):
+        self._protocol.connection_made(MockTransport())
+        with self.assertRaises(asyncio.exceptions.TimeoutError):
+            await get_serial_number(self._protocol, timeout=timedelta(seconds=0))
+
+        # The request must have been ended so that another one can begin.
+        self._protocol.begin_api_request()
+
     async def test_set_date_and_time(self):
         transport = MockRespondingTransport(self._protocol, "DTM\r\n".encode())
         self._protocol.connection_made(transport)
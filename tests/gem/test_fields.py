@@ -1,4 +1,5 @@
 import unittest
+from array import array
 from datetime import datetime
 
 from siobrultech_protocols.gem.fields import (
@@ -9,6 +10,7 @@ from siobrultech_protocols.gem.fields import (
     DateTimeField,
     FloatingPointArrayField,
     FloatingPointField,
+    NullableFloatingPointArrayField,
     NumericArrayField,
     NumericField,
     Sign,
@@ -90,20 +92,51 @@ class TestFieldParsing(unittest.TestCase):
 
     def testNumericArrayFieldRead(self):
         self.assertEqual(
-            [1, 2, 3, 4],
+            array("Q", [1, 2, 3, 4]),
             NumericArrayField(4, 2, ByteOrder.HiToLo, Sign.Unsigned).read(
                 b"\x05\x00\x01\x00\x02\x00\x03\x00\x04", 1
             ),
         )
 
+    def testNumericArrayFieldSignedRead(self):
+        self.assertEqual(
+            array("q", [1, -2, 3, -4]),
+            NumericArrayField(4, 2, ByteOrder.LoToHi, Sign.Signed).read(
+                b"\x05\x01\x00\x02\x80\x03\x00\x04\x80", 1
+            ),
+        )
+
+    def testNumericArrayFieldOddSizeRead(self):
+        buffer = b"\x05\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a"
+        self.assertEqual(
+            array("Q", [0x0504030201, 0x0A09080706]),
+            NumericArrayField(2, 5, ByteOrder.LoToHi, Sign.Unsigned).read(buffer, 1),
+        )
+        self.assertEqual(
+            array("Q", [0x010203, 0x040506, 0x070809]),
+            NumericArrayField(3, 3, ByteOrder.HiToLo, Sign.Unsigned).read(buffer, 1),
+        )
+        self.assertEqual(
+            array("Q", [0x07060504030201]),
+            NumericArrayField(1, 7, ByteOrder.LoToHi, Sign.Unsigned).read(buffer, 1),
+        )
+
     def testFloatingPointArrayFieldRead(self):
         self.assertEqual(
-            [0.5, 1.0, 1.5, 2.0],
+            array("d", [0.5, 1.0, 1.5, 2.0]),
             FloatingPointArrayField(4, 2, ByteOrder.HiToLo, Sign.Unsigned, 2.0).read(
                 b"\x05\x00\x01\x00\x02\x00\x03\x00\x04", 1
             ),
         )
 
+    def testNullableFloatingPointArrayFieldRead(self):
+        self.assertEqual(
+            [0.5, None, -1.5],
+            NullableFloatingPointArrayField(
+                3, 2, ByteOrder.LoToHi, Sign.Signed, 2.0, max_value=255.0
+            ).read(b"\x05\x01\x00\x02\x02\x03\x80", 1),
+        )
+
 
 class TestFieldFormatting(unittest.TestCase):
     def setUp(self):
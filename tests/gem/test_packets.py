@@ -1,10 +1,15 @@
 import functools
 import inspect
+import json
 import unittest
+from array import array
+from datetime import datetime
+from unittest.mock import patch
 
 import pytest
 
 from siobrultech_protocols.gem import packets
+from siobrultech_protocols.gem.fields import ByteField, ByteOrder, NumericField, Sign
 from tests.gem.packet_test_data import assert_packet, read_packet
 
 packet_maker = functools.partial(
@@ -42,6 +47,29 @@ def test_simple_packet(file_name: str, packet_format: packets.PacketFormat) -> N
         assert f'"{name}"' in str(packet)
 
 
+def test_orjson_matches_json() -> None:
+    pytest.importorskip("orjson")
+    packet_format = packets.BIN48_NET_TIME
+    packet = parse_packet("BIN48-NET-TIME.bin", packet_format)
+
+    # Drop the cached format description so each backend builds its own.
+    packet_format.__dict__.pop("_description", None)
+    with patch.object(packets, "_dumps", json.dumps):
+        json_text = str(packet)
+    packet_format.__dict__.pop("_description", None)
+    orjson_text = str(packet)
+
+    assert json.loads(orjson_text) == json.loads(json_text)
+    assert json.loads(json_text)["packet_format"] == json.dumps(
+        {
+            "name": "BIN48-NET-TIME",
+            "type": "BIN48_NET_TIME",
+            "code": 5,
+            "num_channels": 48,
+        }
+    )
+
+
 class TestPacketFormats(unittest.TestCase):
     def test_bin48_net_time_tricky(self):
         """BIN48_NET and BIN48_NET_TIME packets both have the same packet type
@@ -65,6 +93,53 @@ class TestPacketFormats(unittest.TestCase):
         ):
             packets.BIN32_NET.parse(packet[:-1])
 
+    def test_bad_checksum(self):
+        packet = bytearray(read_packet("BIN32-NET.bin"))
+        packet[-1] = (packet[-1] + 1) & 0xFF
+        with self.assertRaisesRegex(packets.MalformedPacketException, "bad checksum"):
+            packets.BIN32_NET.parse(packet)
+
+    def test_bad_code(self):
+        packet = bytearray(read_packet("BIN32-NET.bin"))
+        packet[2] = packets.BIN32_ABS.code
+        packet[-1] = sum(packet[:-1]) & 0xFF
+        with self.assertRaisesRegex(packets.MalformedPacketException, "bad code"):
+            packets.BIN32_NET.parse(packet)
+
+    def test_code_not_after_header(self):
+        packet_format = packets.PacketFormat(
+            "TEST", packets.PacketFormatType.BIN32_ABS, code=9, num_channels=0
+        )
+        packet_format.fields["header"] = NumericField(
+            2, ByteOrder.HiToLo, Sign.Unsigned
+        )
+        packet_format.fields["device_id"] = NumericField(
+            1, ByteOrder.HiToLo, Sign.Unsigned
+        )
+        packet_format.fields["code"] = NumericField(1, ByteOrder.HiToLo, Sign.Unsigned)
+        packet_format.fields["footer"] = NumericField(
+            2, ByteOrder.HiToLo, Sign.Unsigned
+        )
+        packet_format.fields["checksum"] = ByteField()
+
+        packet = bytearray(b"\xfe\xff\x09\x09\xff\xfe\x00")
+        packet[-1] = sum(packet[:-1]) & 0xFF
+        self.assertEqual(9, packet_format.parse(packet).device_id)
+
+        packet[2:4] = b"\x09\x08"
+        packet[-1] = sum(packet[:-1]) & 0xFF
+        with self.assertRaisesRegex(packets.MalformedPacketException, "bad code"):
+            packet_format.parse(packet)
+
+    def test_array_types(self):
+        gem_packet = parse_packet("BIN32-NET.bin", packets.BIN32_NET)
+        self.assertIsInstance(gem_packet.temperatures, list)
+        self.assertEqual(array("Q"), gem_packet.aux)
+
+        ecm_packet = parse_packet("ECM-1240.bin", packets.ECM_1240)
+        self.assertEqual(array("Q"), ecm_packet.pulse_counts)
+        self.assertIsInstance(ecm_packet.aux, array)
+
     def test_packet_with_extra_after(self):
         data = bytearray()
         data.extend(read_packet("BIN32-NET.bin"))
@@ -74,6 +149,21 @@ class TestPacketFormats(unittest.TestCase):
         assert_packet("BIN32-NET.bin", packet)
 
 
+class TestPacketTimeStamp(unittest.TestCase):
+    def test_default_time_stamp(self):
+        before = datetime.now()
+        packet = packet_maker()
+        after = datetime.now()
+
+        self.assertTrue(before <= packet.time_stamp <= after)
+        self.assertIs(packet.time_stamp, packet.time_stamp)
+
+    def test_given_time_stamp(self):
+        time_stamp = datetime(2020, 1, 2, 3, 4, 5)
+        packet = packet_maker(time_stamp=time_stamp)
+        self.assertEqual(time_stamp, packet.time_stamp)
+
+
 class TestPacketDeltaComputation(unittest.TestCase):
     def test_packet_delta_seconds(self):
         packet = parse_packet("BIN32-ABS.bin", packets.BIN32_ABS)
@@ -82,6 +172,14 @@ class TestPacketDeltaComputation(unittest.TestCase):
         self.assertEqual(997493, packet.delta_seconds(2**24 - 1))
         self.assertEqual(1000000, packet.delta_seconds(2**24 - (1000000 - 997492)))
 
+    def test_packet_format_max_values(self):
+        max_values = packets.BIN32_NET.max_values
+        self.assertEqual(2**24 - 1, max_values["seconds"])
+        self.assertEqual(2**24 - 1, max_values["pulse_counts"])
+        self.assertEqual(2**40 - 1, max_values["absolute_watt_seconds"])
+        self.assertEqual(2**40 - 1, max_values["polarized_watt_seconds"])
+        self.assertNotIn("voltage", max_values)
+
     def test_packet_delta_pulses(self):
         packet = parse_packet("BIN48-NET-TIME_tricky.bin", packets.BIN48_NET_TIME)
 
@@ -141,7 +239,7 @@ class TestPacketDeltaComputation(unittest.TestCase):
                 5,
                 647375119,
             ],
-            packet.absolute_watt_seconds,
+            list(packet.absolute_watt_seconds),
         )
 
         self.assertEqual(